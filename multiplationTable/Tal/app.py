@@ -1,33 +1,581 @@
 """
 Multiplication Table Game - Flask Backend
 """
-from flask import Flask, jsonify, request, send_from_directory
+from collections import Counter, OrderedDict
+from itertools import accumulate
+from flask import Flask, Response, abort, g, jsonify, request
+import gzip
+import hashlib
+import mimetypes
+import os
 import random
+import sqlite3
+import sys
+import threading
 import time
 
-app = Flask(__name__, static_folder='static')
+# brotli is in requirements.txt; without it only gzip variants are served
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Static files are served by serve_static below, not Flask's built-in route
+app = Flask(__name__, static_folder=None)
 
 # In-memory game sessions (for simplicity)
 game_sessions = {}
 
+# Static assets, read and precompressed once at startup
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+static_assets = {}
+hashed_static_names = {}
+
+# Per-player fact statistics and alias tables for adaptive games, kept for
+# the most recently active adaptive players only (least recently used first)
+PLAYER_STATS_CACHE_SIZE = 1000
+player_stats = OrderedDict()
+player_stats_lock = threading.Lock()
+# Held while a finished game is written to player_fact_stats and folded into
+# the cache; the generation counts those writes so that cache loads, which
+# read the database without any lock, can tell if one raced with them
+player_stats_write_lock = threading.Lock()
+player_stats_generation = 0
+
+# Per-route request metrics, exposed on /metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+route_metrics = {}
+in_flight_requests = 0
+metrics_lock = threading.Lock()
+started_at = time.time()
+
+# Opt-in profiler: PROFILE_SAMPLE_RATE=0.05 profiles 5% of requests and
+# appends folded stacks (flamegraph.pl / speedscope format) to PROFILE_DIR;
+# each count in those files is one PROFILE_INTERVAL (seconds) of wall time
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+)
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', '0.0001'))
+profile_lock = threading.Lock()
+
+# Finished games are persisted here so results outlive their session
+RESULTS_DB = os.environ.get(
+    'RESULTS_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.db')
+)
+# Guards each session's 'recorded' flag, so a game is saved at most once
+record_lock = threading.Lock()
+
+
+def get_db():
+    """Open a connection to the results database"""
+    conn = sqlite3.connect(RESULTS_DB)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_db():
+    """Create the results tables and indexes if they don't exist yet"""
+    with get_db() as conn:
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                player_name TEXT NOT NULL,
+                final_score INTEGER NOT NULL,
+                correct_count INTEGER NOT NULL,
+                accuracy_percentage REAL NOT NULL,
+                total_time REAL NOT NULL,
+                finished_at REAL NOT NULL,
+                adaptive INTEGER NOT NULL DEFAULT 0
+            );
+
+            -- One row per multiplication fact (at most 100)
+            CREATE TABLE IF NOT EXISTS fact_stats (
+                num1 INTEGER NOT NULL,
+                num2 INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                total_time REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (num1, num2)
+            );
+
+            -- Running totals, kept in a single row so stats need no scan
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                games_played INTEGER NOT NULL DEFAULT 0,
+                questions_answered INTEGER NOT NULL DEFAULT 0,
+                correct_answers INTEGER NOT NULL DEFAULT 0,
+                total_score INTEGER NOT NULL DEFAULT 0,
+                best_score INTEGER NOT NULL DEFAULT 0
+            );
+            INSERT OR IGNORE INTO totals (id) VALUES (1);
+
+            -- Per-player fact history, used to seed adaptive games
+            CREATE TABLE IF NOT EXISTS player_fact_stats (
+                player_name TEXT NOT NULL,
+                num1 INTEGER NOT NULL,
+                num2 INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0,
+                total_time REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (player_name, num1, num2)
+            );
+        ''')
+
+        # Databases created before adaptive games existed lack the column
+        columns = [row['name'] for row in conn.execute('PRAGMA table_info(games)')]
+        if 'adaptive' not in columns:
+            conn.execute('ALTER TABLE games ADD COLUMN adaptive INTEGER NOT NULL DEFAULT 0')
+
+        # Leaderboard reads walk this index instead of scanning all games;
+        # adaptive and uniform games are ranked separately
+        conn.executescript('''
+            DROP INDEX IF EXISTS idx_games_leaderboard;
+            CREATE INDEX IF NOT EXISTS idx_games_leaderboard_mode
+                ON games (adaptive, final_score DESC, total_time ASC);
+        ''')
+    conn.close()
+
+
+def record_game(session_id, session):
+    """Persist a finished game and update the leaderboard and aggregates"""
+    total_time = sum(session['times'])
+    accuracy_percentage = (session['correct_count'] / 20) * 100
+
+    with get_db() as conn:
+        conn.execute(
+            '''INSERT INTO games (session_id, player_name, final_score, correct_count,
+                                  accuracy_percentage, total_time, finished_at, adaptive)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+            (session_id, session['player_name'], session['score'], session['correct_count'],
+             accuracy_percentage, total_time, time.time(), int(session['adaptive']))
+        )
+        conn.executemany(
+            '''INSERT INTO fact_stats (num1, num2, attempts, misses, total_time)
+               VALUES (?, ?, 1, ?, ?)
+               ON CONFLICT (num1, num2) DO UPDATE SET
+                   attempts = attempts + 1,
+                   misses = misses + excluded.misses,
+                   total_time = total_time + excluded.total_time''',
+            [(q['num1'], q['num2'], 0 if a['is_correct'] else 1, a['time_taken'])
+             for q, a in zip(session['questions'], session['answers'])]
+        )
+        conn.executemany(
+            '''INSERT INTO player_fact_stats (player_name, num1, num2, attempts, misses, total_time)
+               VALUES (?, ?, ?, 1, ?, ?)
+               ON CONFLICT (player_name, num1, num2) DO UPDATE SET
+                   attempts = attempts + 1,
+                   misses = misses + excluded.misses,
+                   total_time = total_time + excluded.total_time''',
+            [(session['player_name'], q['num1'], q['num2'], 0 if a['is_correct'] else 1,
+              a['time_taken'])
+             for q, a in zip(session['questions'], session['answers'])]
+        )
+        conn.execute(
+            '''UPDATE totals SET
+                   games_played = games_played + 1,
+                   questions_answered = questions_answered + ?,
+                   correct_answers = correct_answers + ?,
+                   total_score = total_score + ?,
+                   best_score = MAX(best_score, ?)
+               WHERE id = 1''',
+            (len(session['answers']), session['correct_count'], session['score'], session['score'])
+        )
+    conn.close()
+
+
+# Facts need this many attempts before they can rank among the hardest
+HARDEST_FACT_MIN_ATTEMPTS = 3
+
+
+def fact_to_dict(row):
+    """Convert a fact_stats row into its JSON shape"""
+    return {
+        'num1': row['num1'],
+        'num2': row['num2'],
+        'attempts': row['attempts'],
+        'misses': row['misses'],
+        'error_rate': round(row['misses'] / row['attempts'] * 100, 1),
+        'average_time': round(row['total_time'] / row['attempts'], 2)
+    }
+
+
+def fact_weight(attempts, misses, total_time):
+    """Sampling weight for a fact: higher for facts missed often or answered slowly"""
+    # Smoothed miss rate, so unseen facts sit in the middle (0.5)
+    miss_rate = (misses + 1) / (attempts + 2)
+    # Answers taking 6s or more earn no speed bonus, so treat that as fully slow
+    slowness = min(total_time / attempts / 6, 1) if attempts else 0
+    return 1 + 4 * miss_rate + 2 * slowness
+
+
+def build_alias_table(weights):
+    """Build Vose alias tables so a weighted index can be drawn in O(1)"""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+
+    small = [i for i, p in enumerate(scaled) if p < 1]
+    large = [i for i, p in enumerate(scaled) if p >= 1]
+    while small and large:
+        lo = small.pop()
+        hi = large.pop()
+        prob[lo] = scaled[lo]
+        alias[lo] = hi
+        scaled[hi] -= 1 - scaled[lo]
+        if scaled[hi] < 1:
+            small.append(hi)
+        else:
+            large.append(hi)
+
+    return prob, alias
+
+
+def sample_alias_table(prob, alias):
+    """Draw one index from alias tables built by build_alias_table"""
+    i = random.randrange(len(prob))
+    return i if random.random() < prob[i] else alias[i]
+
+
+def load_player_stats(player_name):
+    """Load a player's fact statistics from the database and build their alias table"""
+    stats = {
+        'attempts': [0] * 100,
+        'misses': [0] * 100,
+        'total_time': [0.0] * 100
+    }
+    conn = get_db()
+    rows = conn.execute(
+        'SELECT * FROM player_fact_stats WHERE player_name = ?', (player_name,)
+    ).fetchall()
+    conn.close()
+    for row in rows:
+        fact = (row['num1'] - 1) * 10 + (row['num2'] - 1)
+        stats['attempts'][fact] = row['attempts']
+        stats['misses'][fact] = row['misses']
+        stats['total_time'][fact] = row['total_time']
+
+    stats['weights'] = [
+        fact_weight(a, m, t)
+        for a, m, t in zip(stats['attempts'], stats['misses'], stats['total_time'])
+    ]
+    # prob and alias are stored as one tuple so readers never mix two tables
+    stats['table'] = build_alias_table(stats['weights'])
+    return stats
+
+
+def get_player_stats(player_name):
+    """Get a player's cached fact statistics, loading them on first use"""
+    with player_stats_lock:
+        stats = player_stats.get(player_name)
+        if stats is not None:
+            player_stats.move_to_end(player_name)
+            return stats
+
+    # Load without holding any lock, so cache hits never wait on the database
+    generation = player_stats_generation
+    stats = load_player_stats(player_name)
+
+    with player_stats_write_lock:
+        if generation != player_stats_generation:
+            # A game was saved while we were loading, so the rows we read may
+            # or may not include it; reload now that no save can run
+            stats = load_player_stats(player_name)
+        with player_stats_lock:
+            # Another request may have loaded this player in the meantime
+            stats = player_stats.setdefault(player_name, stats)
+            player_stats.move_to_end(player_name)
+            if len(player_stats) > PLAYER_STATS_CACHE_SIZE:
+                player_stats.popitem(last=False)
+    return stats
+
+
+def save_game(session_id, session):
+    """Persist a finished game and fold it into the player's cached statistics"""
+    global player_stats_generation
+    with player_stats_write_lock:
+        record_game(session_id, session)
+        player_stats_generation += 1
+        update_player_stats(session)
+
+
+def update_player_stats(session):
+    """Fold a finished game into the player's cached statistics, if they are cached
+
+    Uncached players are left alone: their next adaptive game loads the
+    same numbers from player_fact_stats, which record_game has just updated.
+    Callers hold player_stats_write_lock, so no load can race with this.
+    """
+    with player_stats_lock:
+        stats = player_stats.get(session['player_name'])
+        if stats is None:
+            return
+
+        for question, answer in zip(session['questions'], session['answers']):
+            fact = (question['num1'] - 1) * 10 + (question['num2'] - 1)
+            stats['attempts'][fact] += 1
+            stats['misses'][fact] += 0 if answer['is_correct'] else 1
+            stats['total_time'][fact] += answer['time_taken']
+            stats['weights'][fact] = fact_weight(
+                stats['attempts'][fact], stats['misses'][fact], stats['total_time'][fact]
+            )
+        # The table is fixed at 100 facts, so rebuilding it once per game
+        # keeps start-game itself down to O(1) draws
+        stats['table'] = build_alias_table(stats['weights'])
+
+
+def make_static_asset(filename, body):
+    """Build the cached representations of one static file"""
+    digest = hashlib.sha256(body).hexdigest()
+    root, ext = os.path.splitext(filename)
+    asset = {
+        'mimetype': mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        'hashed_name': f'{root}.{digest[:12]}{ext}',
+        'encodings': {'identity': (body, digest)}
+    }
+
+    # Keep compressed variants only when they are actually smaller
+    compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed['br'] = brotli.compress(body)
+    for encoding, data in compressed.items():
+        if len(data) < len(body):
+            # Each representation needs its own strong ETag
+            asset['encodings'][encoding] = (data, f'{digest}-{encoding}')
+
+    return asset
+
+
+def load_static_assets():
+    """Read, fingerprint and precompress everything under static/"""
+    static_assets.clear()
+    hashed_static_names.clear()
+
+    pages = {}
+    for dirpath, _, filenames in os.walk(STATIC_DIR):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            filename = os.path.relpath(path, STATIC_DIR).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                body = f.read()
+            if filename.endswith('.html'):
+                pages[filename] = body
+                continue
+            static_assets[filename] = make_static_asset(filename, body)
+
+    # Point the HTML pages at the content-hashed names, so browsers can
+    # cache those forever and still pick up changes after a deploy
+    for filename, body in pages.items():
+        html = body.decode('utf-8')
+        for name, asset in static_assets.items():
+            html = html.replace(f'/static/{name}"', f'/static/{asset["hashed_name"]}"')
+        static_assets[filename] = make_static_asset(filename, html.encode('utf-8'))
+
+    for name, asset in static_assets.items():
+        hashed_static_names[asset['hashed_name']] = name
+
+
+def serve_static_asset(filename, immutable):
+    """Serve a cached static asset, answering conditional requests with 304"""
+    asset = static_assets.get(filename)
+    if asset is None:
+        abort(404)
+
+    encodings = asset['encodings']
+    encoding = 'identity'
+    for candidate in ('br', 'gzip'):
+        if candidate in encodings and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    body, etag = encodings[encoding]
+
+    if immutable:
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = 'no-cache'
+
+    # If-None-Match uses weak comparison (RFC 7232), so W/"..." from proxies matches too
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=asset['mimetype'])
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def fold_stack(frame):
+    """Render a frame and its callers as one folded-stack line, outermost first"""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+def start_profiler():
+    """Start profiling the current thread's stack
+
+    A sampler thread can't get the GIL while a short handler runs, so it
+    would only ever see the request between handlers. Instead, a per-thread
+    profile hook looks at the request's own stack on call/return events and
+    charges it with every whole PROFILE_INTERVAL that has passed since the
+    last charge. A single slow call (a sleep, a blocking query) therefore
+    weighs as much as the time it took, not as one event. Time spent in a
+    C function is charged on its return, with the function as the leaf.
+    """
+    profile = {
+        'stacks': Counter(),
+        'last_charge': time.perf_counter()
+    }
+
+    def sample(frame, event, arg):
+        intervals = int((time.perf_counter() - profile['last_charge']) / PROFILE_INTERVAL)
+        if intervals:
+            # Keep the leftover fraction so it's charged on a later event
+            profile['last_charge'] += intervals * PROFILE_INTERVAL
+            stack = fold_stack(frame)
+            if event == 'c_return':
+                stack += f';{getattr(arg, "__qualname__", "<builtin>")} (builtin)'
+            profile['stacks'][stack] += intervals
+
+    sys.setprofile(sample)
+    return profile
+
+
+def stop_profiler(profile, endpoint):
+    """Stop profiling the current thread and append its stacks to the endpoint's file"""
+    sys.setprofile(None)
+    if not profile['stacks']:
+        return
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    lines = ''.join(f'{stack} {count}\n' for stack, count in profile['stacks'].items())
+    with profile_lock:
+        with open(os.path.join(PROFILE_DIR, f'{endpoint}.folded'), 'a') as f:
+            f.write(lines)
+
+
+def record_request(route, duration, status):
+    """Add one finished request to its route's latency histogram"""
+    metrics = route_metrics.get(route)
+    if metrics is None:
+        metrics = route_metrics[route] = {
+            'count': 0,
+            'statuses': Counter(),
+            'total_time': 0.0,
+            'max_time': 0.0,
+            'buckets': [0] * (len(LATENCY_BUCKETS) + 1)
+        }
+
+    metrics['count'] += 1
+    metrics['statuses'][f'{status // 100}xx'] += 1
+    metrics['total_time'] += duration
+    metrics['max_time'] = max(metrics['max_time'], duration)
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if duration <= bound:
+            metrics['buckets'][i] += 1
+            break
+    else:
+        metrics['buckets'][-1] += 1
+
+
+def memory_usage():
+    """Current and peak resident memory of this process, in kilobytes"""
+    usage = {'rss_kb': None, 'max_rss_kb': None}
+    try:
+        with open('/proc/self/statm') as f:
+            usage['rss_kb'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        pass
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux reports kilobytes
+        usage['max_rss_kb'] = max_rss // 1024 if sys.platform == 'darwin' else max_rss
+    return usage
+
+
+@app.before_request
+def start_request_metrics():
+    global in_flight_requests
+    with metrics_lock:
+        in_flight_requests += 1
+    g.request_start = time.perf_counter()
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        g.profile = start_profiler()
+
+@app.after_request
+def record_response_status(response):
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error):
+    global in_flight_requests
+    if 'request_start' not in g:
+        return
+    duration = time.perf_counter() - g.request_start
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    # after_request is skipped when an exception escapes, which ends in a 500
+    status = 500 if error is not None else g.get('response_status', 500)
+
+    if 'profile' in g:
+        stop_profiler(g.profile, request.endpoint or 'unmatched')
+
+    with metrics_lock:
+        in_flight_requests -= 1
+        record_request(route, duration, status)
+
+
+init_db()
+load_static_assets()
+
 @app.route('/')
 def serve_index():
-    return send_from_directory('static', 'index.html')
+    return serve_static_asset('index.html', immutable=False)
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
-    return send_from_directory('static', filename)
+    # Content-hashed names never change, so they can be cached for a year;
+    # plain names are revalidated with their ETag on every use
+    if filename in hashed_static_names:
+        return serve_static_asset(hashed_static_names[filename], immutable=True)
+    return serve_static_asset(filename, immutable=False)
 
 @app.route('/api/start-game', methods=['POST'])
 def start_game():
     """Initialize a new game session with 20 questions"""
+    data = request.get_json(silent=True) or {}
+    player_name = (data.get('player_name') or '').strip()[:30] or 'Anonymous'
+    adaptive = bool(data.get('adaptive'))
     session_id = str(random.randint(10000, 99999))
 
-    # Generate 20 random multiplication questions
+    if adaptive:
+        prob, alias = get_player_stats(player_name)['table']
+
+    # Generate 20 multiplication questions, weighted towards weak facts when adaptive
     questions = []
     for _ in range(20):
-        num1 = random.randint(1, 10)
-        num2 = random.randint(1, 10)
+        if adaptive:
+            num1, num2 = divmod(sample_alias_table(prob, alias), 10)
+            num1 += 1
+            num2 += 1
+        else:
+            num1 = random.randint(1, 10)
+            num2 = random.randint(1, 10)
         questions.append({
             'num1': num1,
             'num2': num2,
@@ -35,6 +583,8 @@ def start_game():
         })
 
     game_sessions[session_id] = {
+        'player_name': player_name,
+        'adaptive': adaptive,
         'questions': questions,
         'current_question': 0,
         'answers': [],
@@ -46,7 +596,8 @@ def start_game():
 
     return jsonify({
         'session_id': session_id,
-        'total_questions': 20
+        'total_questions': 20,
+        'adaptive': adaptive
     })
 
 @app.route('/api/get-question', methods=['POST'])
@@ -95,7 +646,8 @@ def submit_answer():
     session['times'].append(time_taken)
 
     # Check answer
-    correct_answer = session['questions'][current_q]['answer']
+    question = session['questions'][current_q]
+    correct_answer = question['answer']
     is_correct = int(user_answer) == correct_answer
 
     # Calculate points
@@ -126,6 +678,18 @@ def submit_answer():
 
     session['current_question'] += 1
 
+    if session['current_question'] >= 20:
+        # Two final submits can race here (e.g. a double-click); only the
+        # first one saves the game
+        with record_lock:
+            already_recorded = session.get('recorded', False)
+            session['recorded'] = True
+        if not already_recorded:
+            try:
+                save_game(session_id, session)
+            except sqlite3.Error:
+                app.logger.exception('Could not save results for session %s', session_id)
+
     return jsonify({
         'is_correct': is_correct,
         'correct_answer': correct_answer,
@@ -161,7 +725,148 @@ def get_results():
         'answers': session['answers']
     })
 
+@app.route('/api/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Get the top finished games, best score first
+
+    Adaptive games draw each player's weakest facts, so their scores are
+    ranked separately: ?adaptive=1 for adaptive games, uniform by default.
+    """
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    adaptive = request.args.get('adaptive', 0, type=int) == 1
+
+    conn = get_db()
+    rows = conn.execute(
+        '''SELECT player_name, final_score, correct_count, accuracy_percentage,
+                  total_time, finished_at, adaptive
+           FROM games
+           WHERE adaptive = ?
+           ORDER BY final_score DESC, total_time ASC
+           LIMIT ?''',
+        (int(adaptive), limit)
+    ).fetchall()
+    conn.close()
+
+    return jsonify({
+        'leaderboard': [
+            {
+                'rank': rank,
+                'player_name': row['player_name'],
+                'final_score': row['final_score'],
+                'correct_count': row['correct_count'],
+                'accuracy_percentage': round(row['accuracy_percentage'], 1),
+                'total_time': round(row['total_time'], 2),
+                'finished_at': row['finished_at'],
+                'adaptive': bool(row['adaptive'])
+            }
+            for rank, row in enumerate(rows, start=1)
+        ]
+    })
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Get aggregate statistics across all finished games"""
+    conn = get_db()
+    totals = conn.execute('SELECT * FROM totals WHERE id = 1').fetchone()
+    # Rank by the same smoothed miss rate as fact_weight, so a single
+    # unlucky miss can't outrank a fact that is missed again and again
+    hardest = conn.execute(
+        '''SELECT * FROM fact_stats
+           WHERE attempts >= ?
+           ORDER BY (misses + 1.0) / (attempts + 2) DESC, attempts DESC
+           LIMIT 5''',
+        (HARDEST_FACT_MIN_ATTEMPTS,)
+    ).fetchall()
+    conn.close()
+
+    games_played = totals['games_played']
+    questions_answered = totals['questions_answered']
+
+    return jsonify({
+        'games_played': games_played,
+        'questions_answered': questions_answered,
+        'accuracy_percentage': round(
+            totals['correct_answers'] / questions_answered * 100, 1
+        ) if questions_answered else 0,
+        'average_score': round(totals['total_score'] / games_played, 1) if games_played else 0,
+        'best_score': totals['best_score'],
+        'hardest_facts': [fact_to_dict(row) for row in hardest]
+    })
+
+@app.route('/api/fact-stats', methods=['GET'])
+def get_fact_stats():
+    """Get per-fact error rates, optionally filtered by num1 and/or num2"""
+    filters = []
+    params = []
+    for name in ('num1', 'num2'):
+        if name not in request.args:
+            continue
+        value = request.args.get(name, type=int)
+        if value is None or not 1 <= value <= 10:
+            return jsonify({'error': f'{name} must be a whole number from 1 to 10'}), 400
+        filters.append(f'{name} = ?')
+        params.append(value)
+
+    where = f'WHERE {" AND ".join(filters)}' if filters else ''
+    conn = get_db()
+    rows = conn.execute(
+        f'SELECT * FROM fact_stats {where} ORDER BY num1, num2', params
+    ).fetchall()
+    conn.close()
+
+    return jsonify({'facts': [fact_to_dict(row) for row in rows]})
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Get per-route latency histograms, live request/session counts and memory use"""
+    with metrics_lock:
+        routes = {}
+        for route, metrics in route_metrics.items():
+            bounds = [bound * 1000 for bound in LATENCY_BUCKETS] + [None]
+            cumulative = accumulate(metrics['buckets'])
+            routes[route] = {
+                'count': metrics['count'],
+                # 4xx and 5xx responses, including handled aborts
+                'errors': metrics['statuses']['4xx'] + metrics['statuses']['5xx'],
+                'statuses': dict(metrics['statuses']),
+                'average_ms': round(metrics['total_time'] / metrics['count'] * 1000, 3),
+                'max_ms': round(metrics['max_time'] * 1000, 3),
+                # Cumulative, as in Prometheus: requests that took at most
+                # le_ms; the last bucket (None) is unbounded and counts all
+                'histogram': [
+                    {'le_ms': bound, 'count': count}
+                    for bound, count in zip(bounds, cumulative)
+                ]
+            }
+        # This request counts itself as in flight
+        in_flight = in_flight_requests
+
+    return jsonify({
+        'uptime_seconds': round(time.time() - started_at, 1),
+        'in_flight_requests': in_flight,
+        'sessions': {
+            'game_sessions': len(game_sessions),
+            'active_games': sum(
+                1 for session in list(game_sessions.values()) if session['current_question'] < 20
+            ),
+            'player_stats': len(player_stats)
+        },
+        'memory': memory_usage(),
+        'profiling': {
+            'sample_rate': PROFILE_SAMPLE_RATE,
+            'profile_dir': PROFILE_DIR if PROFILE_SAMPLE_RATE else None
+        },
+        'routes': routes
+    })
+
 if __name__ == '__main__':
     print("Starting Multiplication Table Game Server...")
     print("Open http://localhost:5001 in your browser")
-    app.run(debug=True, port=5001)
+    # Static files are cached in memory at startup, so have the reloader
+    # restart on their changes too, not just on Python modules
+    static_files = [
+        os.path.join(dirpath, name)
+        for dirpath, _, filenames in os.walk(STATIC_DIR)
+        for name in filenames
+    ]
+    app.run(debug=True, port=5001, extra_files=static_files)
@@ -0,0 +1,97 @@
+"""
+Benchmark static serving: bytes transferred and requests/sec for the
+cached, precompressed layer in app.py versus plain send_from_directory.
+
+Usage: python bench_static.py [iterations]
+"""
+import gzip
+import sys
+import time
+
+from flask import Flask, send_from_directory
+
+import app as game_app
+
+ACCEPT_ENCODING = 'gzip, br'
+
+
+def make_baseline_app():
+    """The previous static setup: send_from_directory on every hit"""
+    baseline = Flask(__name__, static_folder=None)
+
+    @baseline.route('/')
+    def serve_index():
+        return send_from_directory(game_app.STATIC_DIR, 'index.html')
+
+    @baseline.route('/static/<path:filename>')
+    def serve_static(filename):
+        return send_from_directory(game_app.STATIC_DIR, filename)
+
+    return baseline
+
+
+def page_urls(client):
+    """The URLs a browser fetches for one page load"""
+    response = client.get('/', headers={'Accept-Encoding': ACCEPT_ENCODING})
+    body = response.get_data()
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'br':
+        body = game_app.brotli.decompress(body)
+    html = body.decode('utf-8')
+
+    urls = ['/']
+    for marker in ('href="/static/', 'src="/static/'):
+        start = 0
+        while (start := html.find(marker, start)) != -1:
+            start += len(marker)
+            urls.append('/static/' + html[start:html.index('"', start)])
+    return urls
+
+
+def run(client, urls, iterations):
+    """Fetch every URL cold and then revalidate it, timing both"""
+    results = {}
+    etags = {}
+
+    for label in ('cold load', 'repeat load'):
+        total_bytes = 0
+        statuses = set()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for url in urls:
+                headers = {'Accept-Encoding': ACCEPT_ENCODING}
+                if label == 'repeat load' and etags.get(url):
+                    headers['If-None-Match'] = etags[url]
+                response = client.get(url, headers=headers)
+                total_bytes += len(response.get_data())
+                statuses.add(response.status_code)
+                etags[url] = response.headers.get('ETag')
+        elapsed = time.perf_counter() - started
+
+        results[label] = {
+            'bytes_per_page': total_bytes // iterations,
+            'requests_per_sec': iterations * len(urls) / elapsed,
+            'statuses': sorted(statuses)
+        }
+
+    return results
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    for name, flask_app in (('send_from_directory', make_baseline_app()),
+                            ('cached static layer', game_app.app)):
+        client = flask_app.test_client()
+        urls = page_urls(client)
+        print(f'{name} ({len(urls)} requests per page, {iterations} pages)')
+        for label, result in run(client, urls, iterations).items():
+            print(f"  {label:12} {result['bytes_per_page']:>8} bytes/page"
+                  f"  {result['requests_per_sec']:>9.0f} req/s"
+                  f"  status {result['statuses']}")
+
+
+if __name__ == '__main__':
+    main()
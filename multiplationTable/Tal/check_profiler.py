@@ -0,0 +1,84 @@
+"""
+Check that the profiler in app.py captures the view functions it profiles,
+rather than only its own startup, and that its counts follow wall time.
+
+Usage: python check_profiler.py [requests]
+"""
+import os
+import sys
+import tempfile
+import time
+
+work_dir = tempfile.mkdtemp()
+os.environ['PROFILE_SAMPLE_RATE'] = '1'
+os.environ['PROFILE_DIR'] = os.path.join(work_dir, 'profiles')
+os.environ['RESULTS_DB'] = os.path.join(work_dir, 'results.db')
+
+import app as game_app  # noqa: E402  (reads the settings above at import)
+
+SLEEP_SECONDS = 0.2
+
+
+@game_app.app.route('/check-slow')
+def check_slow():
+    # One long call followed by a few milliseconds of many short calls
+    time.sleep(SLEEP_SECONDS)
+    for i in range(2000):
+        abs(-i)
+    return 'ok'
+
+
+def read_stacks(endpoint):
+    """Parse an endpoint's folded stacks into (stack, count) pairs"""
+    path = os.path.join(game_app.PROFILE_DIR, f'{endpoint}.folded')
+    with open(path) as f:
+        return [line.rsplit(' ', 1) for line in f.read().splitlines()], path
+
+
+def check_view_captured(client, requests):
+    for _ in range(requests):
+        client.post('/api/start-game', json={})
+
+    stacks, path = read_stacks('start_game')
+    in_view = sum(1 for stack, _ in stacks if ';start_game (app.py:' in stack)
+    in_profiler = sum(1 for stack, _ in stacks if 'start_profiler' in stack)
+    print(f'{len(stacks)} stacks in {path}')
+    print(f'  {in_view} include start_game, {in_profiler} include start_profiler')
+
+    if not in_view:
+        sys.exit('no sample captured the start_game view')
+    if in_profiler:
+        sys.exit('samples include the profiler starting up')
+
+
+def check_time_weighted(client):
+    client.get('/check-slow')
+
+    stacks, path = read_stacks('check_slow')
+    total = sum(int(count) for _, count in stacks)
+    in_sleep = sum(int(count) for stack, count in stacks if stack.endswith(';sleep (builtin)'))
+    in_loop = sum(int(count) for stack, count in stacks if stack.endswith(';abs (builtin)'))
+    seconds = total * game_app.PROFILE_INTERVAL
+    print(f'{total} intervals ({seconds:.3f}s) in {path}')
+    print(f'  {in_sleep} in time.sleep, {in_loop} in the abs() loop')
+
+    # The sleep is 200ms; the loop takes a few milliseconds at most
+    if in_sleep * game_app.PROFILE_INTERVAL < SLEEP_SECONDS * 0.9:
+        sys.exit('time.sleep was not charged with the time it took')
+    if in_sleep <= in_loop:
+        sys.exit('many short calls outweigh one long call')
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    client = game_app.app.test_client()
+
+    check_view_captured(client, requests)
+    check_time_weighted(client)
+
+    if sys.getprofile() is not None:
+        sys.exit('profile hook was left installed after the request')
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,8 @@ const elements = {
     startBtn: document.getElementById('start-btn'),
     submitBtn: document.getElementById('submit-btn'),
     playAgainBtn: document.getElementById('play-again-btn'),
+    playerName: document.getElementById('player-name'),
+    adaptiveToggle: document.getElementById('adaptive-toggle'),
     answerInput: document.getElementById('answer-input'),
     currentQ: document.getElementById('current-q'),
     totalQ: document.getElementById('total-q'),
@@ -70,7 +72,10 @@ function stopTimer() {
 
 // Game Functions
 async function startGame() {
-    const result = await apiCall('start-game');
+    const result = await apiCall('start-game', {
+        player_name: elements.playerName.value.trim(),
+        adaptive: elements.adaptiveToggle.checked
+    });
     sessionId = result.session_id;
 
     elements.currentScore.textContent = '0';